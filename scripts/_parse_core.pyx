@@ -0,0 +1,115 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+_parse_core.pyx - Compiled fast path for parse_ftrace.py
+
+Optional: parse_ftrace.py builds this with pyximport when Cython is
+installed and otherwise parses every line with its _FTRACE_RE regex.
+This module is the only other grammar, so it must agree with _FTRACE_RE
+on every line it accepts; lines of any other shape return None and fall
+through to the regex. Digits are checked with isdecimal(), which matches
+what \d accepts and what int()/float() can convert.
+"""
+
+
+cdef inline bint _is_word(str s):
+    """True if s is non-empty and every character is alphanumeric or '_'."""
+    cdef Py_UCS4 c
+    if not s:
+        return False
+    for c in s:
+        if not (c == u'_' or c.isalnum()):
+            return False
+    return True
+
+
+cdef inline bint _is_flags(str s):
+    """True if s is non-empty and every character is alphanumeric, '_' or '.'."""
+    cdef Py_UCS4 c
+    if not s:
+        return False
+    for c in s:
+        if not (c == u'.' or c == u'_' or c.isalnum()):
+            return False
+    return True
+
+
+cdef inline bint _is_timestamp(str s):
+    """True if s is decimal digits and dots with at least one digit."""
+    cdef Py_UCS4 c
+    cdef bint digit = False
+    for c in s:
+        if c.isdecimal():
+            digit = True
+        elif c != u'.':
+            return False
+    return digit
+
+
+def split_ftrace_line(str line):
+    """
+    Split an ftrace line into its fields.
+
+    Returns (timestamp, cpu, task, pid, event_type, details), in TraceEvent
+    field order, or None if the line does not have the usual shape.
+    """
+    cdef Py_ssize_t n = len(line)
+    cdef Py_ssize_t bracket, dash, close, i, pid_end
+    cdef Py_UCS4 c
+
+    bracket = line.find(u'[')
+    if bracket < 0:
+        return None
+    dash = line.rfind(u'-', 0, bracket)
+    if dash < 0:
+        return None
+
+    # "task-pid " before the CPU field: digits, then at least one space
+    if not line[bracket - 1].isspace():
+        return None
+    pid_end = bracket - 1
+    while pid_end > dash and line[pid_end].isspace():
+        pid_end -= 1
+    if pid_end == dash:
+        return None
+    for i in range(dash + 1, pid_end + 1):
+        if not line[i].isdecimal():
+            return None
+
+    task = line[:dash].strip()
+    if not task:
+        return None
+
+    close = line.find(u']', bracket)
+    if close < 0 or close == bracket + 1 or close + 1 >= n or not line[close + 1].isspace():
+        return None
+    for i in range(bracket + 1, close):
+        if not line[i].isdecimal():
+            return None
+
+    # flags, "timestamp:", "event: details"
+    fields = line[close + 1:].split(None, 2)
+    if len(fields) < 3:
+        return None
+    flags, timestamp, rest = fields
+    if not _is_flags(flags) or not timestamp.endswith(u':'):
+        return None
+    timestamp = timestamp[:len(timestamp) - 1]
+    if not _is_timestamp(timestamp):
+        return None
+
+    event_type, sep, details = rest.partition(u':')
+    if not sep or not _is_word(event_type):
+        return None
+
+    # Anything int()/float() still rejects (e.g. "1.2.3") is left to the regex
+    try:
+        return (
+            float(timestamp),
+            int(line[bracket + 1:close]),
+            task,
+            int(line[dash + 1:pid_end + 1]),
+            event_type,
+            details.rstrip(u'\n').lstrip(),
+        )
+    except ValueError:
+        return None
@@ -15,13 +15,60 @@ Usage:
 """
 
 import os
+import io
 import sys
 import csv
+import json
+import struct
+import hashlib
 import argparse
-from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Sequence, Tuple
 import math
 
+# NumPy is optional; without it the statistics fall back to pure Python.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Numba is optional; when present the moment kernels are compiled to native code.
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# pandas is optional; without it CSVs are read with the csv module.
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# CSV columns kept as text; every other column is parsed as a float
+LABEL_COLUMNS = ('scenario',)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+    'esm-analyze', 'stats.json'
+)
+
+# Digest of this file, the first part of every cache key: any edit to the
+# statistics code invalidates old entries, which save_cache() then drops
+with open(__file__, 'rb') as _source:
+    CODE_DIGEST = hashlib.blake2b(_source.read(), digest_size=8).hexdigest()
+del _source
+
+# Backend computing the moments, also part of the cache key: the numba,
+# NumPy and fsum paths can differ in the last bits, and a report must not
+# depend on which one happened to fill the cache
+STATS_BACKEND = 'numba' if numba is not None else 'numpy' if np is not None else 'fsum'
+
+# Sample moments: (n, mean, M2) where M2 is the sum of squared deviations
+Moments = Tuple[int, float, float]
+
 
 @dataclass
 class Statistics:
@@ -35,34 +82,264 @@ class Statistics:
     ci_upper: float  # 95% CI upper bound
 
 
-def load_csv(filepath: str) -> List[Dict]:
-    """Load CSV file into list of dictionaries."""
-    if not os.path.exists(filepath):
-        return []
+@dataclass(frozen=True)
+class MetricSpec:
+    """A compared metric: one CSV column, optionally for a single scenario."""
+    name: str
+    filename: str
+    column: str
+    scenario: Optional[str] = None
+    lower_is_better: bool = True
 
-    with open(filepath, 'r') as f:
+
+# Metrics included in the report, in report order
+METRICS = [
+    MetricSpec("Latency - Single Tap (ms)", 'latency.csv', 'latency_ms', 'single_tap'),
+    MetricSpec("Latency - Scroll (ms)", 'latency.csv', 'latency_ms', 'scroll'),
+    MetricSpec("Latency - Fast Swipe (ms)", 'latency.csv', 'latency_ms', 'fast_swipe'),
+    MetricSpec("CPU - system_server (%)", 'cpu.csv', 'system_server_cpu'),
+    MetricSpec("CPU - Total (%)", 'cpu.csv', 'total_cpu'),
+    MetricSpec("Syscalls (per 100 events)", 'syscalls.csv', 'total'),
+    MetricSpec("Wakeups per second", 'wakeups.csv', 'wakeups_per_sec'),
+    MetricSpec("Power - Idle Battery Drain (%)", 'power.csv', 'battery_drain_pct', 'idle'),
+    MetricSpec("Power - Idle Wakeups/sec", 'power.csv', 'wakeups_per_sec', 'idle'),
+    MetricSpec("Power - Active Battery Drain (%)", 'power.csv', 'battery_drain_pct', 'active'),
+    MetricSpec("Power - Active Wakeups/sec", 'power.csv', 'wakeups_per_sec', 'active'),
+]
+
+
+def _parse_float(text: Optional[str]) -> float:
+    """Parse a CSV cell as float, returning NaN for empty or malformed cells."""
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def load_columns(filepath: str, columns: Sequence[str]) -> Dict[str, Sequence]:
+    """
+    Load selected columns of a CSV file.
+
+    Returns a dict mapping each column present in the file to its values.
+    Numeric columns hold floats with NaN for missing or malformed cells
+    (some result files interleave log lines with the data rows).
+    """
+    if not os.path.exists(filepath):
+        return {}
+
+    if pd is not None:
+        try:
+            df = pd.read_csv(filepath, usecols=lambda c: c in columns,
+                             dtype=str, on_bad_lines='skip')
+        except pd.errors.EmptyDataError:
+            # Empty file: no header and no rows, as csv.DictReader sees it
+            return {}
+        table = {}
+        for col in df.columns:
+            if col in LABEL_COLUMNS:
+                table[col] = df[col].fillna('').to_numpy(dtype=str)
+            else:
+                table[col] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+        return table
+
+    with open(filepath, 'r', newline='') as f:
         reader = csv.DictReader(f)
-        return list(reader)
+        table = {col: [] for col in columns if col in (reader.fieldnames or [])}
+        for row in reader:
+            for col, values in table.items():
+                values.append(row.get(col))
+
+    for col, values in table.items():
+        if col in LABEL_COLUMNS:
+            if np is not None:
+                # group_by_scenario works on a str array, as with pandas
+                table[col] = np.asarray([v or '' for v in values], dtype=str)
+            else:
+                # Interned labels share one object per scenario, so the
+                # per-row dict lookups in group_by_scenario hit on identity
+                table[col] = [sys.intern(v or '') for v in values]
+        else:
+            table[col] = to_sample([_parse_float(v) for v in values])
+    return table
+
+
+def column_values(table: Dict[str, Sequence], column: str) -> Sequence[float]:
+    """Return the non-missing values of a column."""
+    values = table.get(column)
+    if values is None:
+        return to_sample([])
+
+    if np is not None:
+        return values[~np.isnan(values)]
+    return [v for v in values if not math.isnan(v)]
+
+
+def group_by_scenario(
+    table: Dict[str, Sequence],
+    column: str
+) -> Dict[str, Sequence[float]]:
+    """Split the non-missing values of a column by scenario in a single pass."""
+    values = table.get(column)
+    if values is None or 'scenario' not in table:
+        return {}
+
+    if np is not None:
+        valid = ~np.isnan(values)
+        labels = np.asarray(table['scenario'], dtype=str)[valid]
+        values = values[valid]
+
+        # Stable sort by scenario index, then cut at the group boundaries
+        keys, inverse = np.unique(labels, return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.cumsum(np.bincount(inverse, minlength=len(keys)))[:-1]
+        return dict(zip(keys.tolist(), np.split(values[order], bounds)))
+
+    groups = defaultdict(list)
+    for value, scenario in zip(values, table['scenario']):
+        if not math.isnan(value):
+            groups[scenario].append(value)
+    return dict(groups)
+
+
+def load_samples(
+    results_dir: str,
+    metrics: Sequence[MetricSpec]
+) -> Dict[Tuple[str, str, Optional[str]], Sequence[float]]:
+    """
+    Load the samples for all metrics from one results directory.
+
+    Each CSV is parsed once with every column the metrics need, and each
+    column is split by scenario at most once.
+    """
+    columns: Dict[str, List[str]] = {}
+    for m in metrics:
+        cols = columns.setdefault(m.filename, [])
+        for col in (m.column, 'scenario' if m.scenario else None):
+            if col and col not in cols:
+                cols.append(col)
+
+    samples = {}
+    for filename, cols in columns.items():
+        table = load_columns(os.path.join(results_dir, filename), cols)
+        grouped = {}
+        for m in metrics:
+            key = (m.filename, m.column, m.scenario)
+            if m.filename != filename or key in samples:
+                continue
+
+            if m.scenario is None:
+                samples[key] = column_values(table, m.column)
+                continue
+
+            if m.column not in grouped:
+                grouped[m.column] = group_by_scenario(table, m.column)
+            samples[key] = grouped[m.column].get(m.scenario, to_sample([]))
+
+    return samples
+
+
+def to_sample(values: Sequence[float]) -> Sequence[float]:
+    """Convert values to the sample type used by the statistics helpers."""
+    if np is not None:
+        return np.asarray(values, dtype=np.float64)
+    return values if isinstance(values, list) else list(values)
+
+
+def _welford(values: Sequence[float]) -> Moments:
+    """Accumulate (n, mean, M2) in a single numerically stable pass."""
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for x in values:
+        n += 1
+        d = x - mean
+        mean += d / n
+        m2 += d * (x - mean)
+    return n, mean, m2
+
+
+def _welch_kernel(
+    n1: int, mean1: float, ss1: float,
+    n2: int, mean2: float, ss2: float
+) -> Tuple[float, float]:
+    """
+    Welch's t-statistic and Welch-Satterthwaite df for n1, n2 >= 2.
+
+    Returns (0, 0) when both samples have zero variance.
+    """
+    se1 = ss1 / (n1 - 1) / n1
+    se2 = ss2 / (n2 - 1) / n2
+    se_sq = se1 + se2
+    if se_sq == 0:
+        return 0.0, 0.0
+
+    t_stat = (mean1 - mean2) / math.sqrt(se_sq)
 
+    denom = se1 * se1 / (n1 - 1) + se2 * se2 / (n2 - 1)
+    df = se_sq * se_sq / denom if denom > 0 else 1.0
 
-def calculate_stats(values: List[float]) -> Optional[Statistics]:
-    """Calculate descriptive statistics for a sample."""
-    if not values:
+    return t_stat, df
+
+
+if numba is not None:
+    # fastmath is deliberately off: reassociation would undo Welford's
+    # numerical stability. nogil lets the metric threads run in parallel.
+    _jit = numba.njit(cache=True, nogil=True)
+    _welford = _jit(_welford)
+    _welch_kernel = _jit(_welch_kernel)
+
+
+def sample_moments(sample: Sequence[float]) -> Moments:
+    """Return the (n, mean, M2) moments of a sample from to_sample()."""
+    if numba is not None:
+        n, mean, m2 = _welford(sample)
+        return int(n), float(mean), float(m2)
+
+    n = len(sample)
+    if n == 0:
+        return 0, 0.0, 0.0
+
+    if np is not None:
+        # Two vectorized passes beat a per-element interpreted loop
+        mean = float(sample.mean())
+        dev = sample - mean
+        return n, mean, float(dev @ dev)
+
+    # Without NumPy, math.fsum's exact summation (C-level iteration) keeps
+    # tightly clustered latency samples from losing precision
+    mean = math.fsum(sample) / n
+    return n, mean, math.fsum((x - mean) * (x - mean) for x in sample)
+
+
+def calculate_stats(
+    values: Sequence[float],
+    moments: Optional[Moments] = None
+) -> Optional[Statistics]:
+    """
+    Calculate descriptive statistics for a sample.
+
+    Pass precomputed moments to avoid another pass over the data.
+    """
+    sample = to_sample(values)
+    if len(sample) == 0:
         return None
 
-    n = len(values)
-    mean = sum(values) / n
+    if np is not None:
+        min_val, max_val = float(sample.min()), float(sample.max())
+    else:
+        min_val, max_val = min(sample), max(sample)
+
+    n, mean, m2 = moments if moments is not None else sample_moments(sample)
 
     if n < 2:
         return Statistics(
             n=n, mean=mean, std=0,
-            min_val=min(values), max_val=max(values),
+            min_val=min_val, max_val=max_val,
             ci_lower=mean, ci_upper=mean
         )
 
     # Standard deviation
-    variance = sum((x - mean) ** 2 for x in values) / (n - 1)
-    std = math.sqrt(variance)
+    std = math.sqrt(m2 / (n - 1))
 
     # 95% confidence interval (using t-distribution approximation)
     # For n > 30, z ≈ 1.96
@@ -73,77 +350,126 @@ def calculate_stats(values: List[float]) -> Optional[Statistics]:
         n=n,
         mean=mean,
         std=std,
-        min_val=min(values),
-        max_val=max(values),
+        min_val=min_val,
+        max_val=max_val,
         ci_lower=mean - margin,
         ci_upper=mean + margin
     )
 
 
-def welch_t_test(sample1: List[float], sample2: List[float]) -> Tuple[float, float]:
+def welch_t_test_from_moments(m1: Moments, m2: Moments) -> Tuple[float, float]:
     """
-    Perform Welch's t-test for unequal variances.
+    Perform Welch's t-test for unequal variances on precomputed moments.
 
-    Returns (t-statistic, approximate p-value).
+    Returns (t-statistic, two-sided p-value).
     """
-    n1, n2 = len(sample1), len(sample2)
+    n1, mean1, ss1 = m1
+    n2, mean2, ss2 = m2
     if n1 < 2 or n2 < 2:
         return 0.0, 1.0
 
-    mean1 = sum(sample1) / n1
-    mean2 = sum(sample2) / n2
+    t_stat, df = _welch_kernel(n1, mean1, ss1, n2, mean2, ss2)
+    if df == 0:
+        return 0.0, 1.0
 
-    var1 = sum((x - mean1) ** 2 for x in sample1) / (n1 - 1)
-    var2 = sum((x - mean2) ** 2 for x in sample2) / (n2 - 1)
+    # Two-sided p-value from the Student-t distribution
+    p_value = 2 * _t_sf(abs(t_stat), df)
 
-    # Welch's t-statistic
-    se = math.sqrt(var1/n1 + var2/n2)
-    if se == 0:
-        return 0.0, 1.0
+    return t_stat, p_value
 
-    t_stat = (mean1 - mean2) / se
 
-    # Welch-Satterthwaite degrees of freedom
-    num = (var1/n1 + var2/n2) ** 2
-    denom = (var1/n1)**2/(n1-1) + (var2/n2)**2/(n2-1)
-    df = num / denom if denom > 0 else 1
+def welch_t_test(sample1: Sequence[float], sample2: Sequence[float]) -> Tuple[float, float]:
+    """
+    Perform Welch's t-test for unequal variances.
 
-    # Approximate p-value using normal distribution for large df
-    # For small df, this underestimates p-value
-    z = abs(t_stat)
-    p_value = 2 * (1 - normal_cdf(z))
+    Returns (t-statistic, two-sided p-value).
+    """
+    return welch_t_test_from_moments(
+        sample_moments(to_sample(sample1)),
+        sample_moments(to_sample(sample2))
+    )
 
-    return t_stat, p_value
 
+def _betacf(a: float, b: float, x: float) -> float:
+    """Continued fraction for the incomplete beta function (modified Lentz)."""
+    tiny = 1e-300
+    eps = 3e-14
+
+    qab = a + b
+    qap = a + 1.0
+    qam = a - 1.0
+    c = 1.0
+    d = 1.0 - qab * x / qap
+    if abs(d) < tiny:
+        d = tiny
+    d = 1.0 / d
+    h = d
+
+    for m in range(1, 201):
+        m2 = 2 * m
+
+        # Even step
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        if abs(d) < tiny:
+            d = tiny
+        c = 1.0 + aa / c
+        if abs(c) < tiny:
+            c = tiny
+        d = 1.0 / d
+        h *= d * c
+
+        # Odd step
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        if abs(d) < tiny:
+            d = tiny
+        c = 1.0 + aa / c
+        if abs(c) < tiny:
+            c = tiny
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+
+        if abs(delta - 1.0) < eps:
+            break
+
+    return h
+
+
+def _betai(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta function I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
 
-def normal_cdf(x: float) -> float:
-    """Approximate cumulative distribution function for standard normal."""
-    # Using error function approximation
-    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+    front = math.exp(
+        math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+        + a * math.log(x) + b * math.log(1.0 - x)
+    )
 
+    # The continued fraction converges quickly only below this point;
+    # use the symmetry I_x(a, b) = 1 - I_(1-x)(b, a) above it
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
 
-def cohens_d(sample1: List[float], sample2: List[float]) -> float:
-    """
-    Calculate Cohen's d effect size.
 
-    Interpretation:
-    - d < 0.2: negligible
-    - 0.2 <= d < 0.5: small
-    - 0.5 <= d < 0.8: medium
-    - d >= 0.8: large
-    """
-    n1, n2 = len(sample1), len(sample2)
-    if n1 < 2 or n2 < 2:
-        return 0.0
+def _t_sf(t: float, df: float) -> float:
+    """One-sided upper tail probability P(T > t) for t >= 0."""
+    return 0.5 * _betai(df / 2.0, 0.5, df / (df + t * t))
 
-    mean1 = sum(sample1) / n1
-    mean2 = sum(sample2) / n2
 
-    var1 = sum((x - mean1) ** 2 for x in sample1) / (n1 - 1)
-    var2 = sum((x - mean2) ** 2 for x in sample2) / (n2 - 1)
+def cohens_d_from_moments(m1: Moments, m2: Moments) -> float:
+    """Calculate Cohen's d effect size on precomputed moments."""
+    n1, mean1, ss1 = m1
+    n2, mean2, ss2 = m2
+    if n1 < 2 or n2 < 2:
+        return 0.0
 
-    # Pooled standard deviation
-    pooled_std = math.sqrt(((n1-1)*var1 + (n2-1)*var2) / (n1+n2-2))
+    # Pooled standard deviation: (n-1)*var is just M2
+    pooled_std = math.sqrt((ss1 + ss2) / (n1+n2-2))
 
     if pooled_std == 0:
         return 0.0
@@ -151,6 +477,22 @@ def cohens_d(sample1: List[float], sample2: List[float]) -> float:
     return (mean1 - mean2) / pooled_std
 
 
+def cohens_d(sample1: Sequence[float], sample2: Sequence[float]) -> float:
+    """
+    Calculate Cohen's d effect size.
+
+    Interpretation:
+    - d < 0.2: negligible
+    - 0.2 <= d < 0.5: small
+    - 0.5 <= d < 0.8: medium
+    - d >= 0.8: large
+    """
+    return cohens_d_from_moments(
+        sample_moments(to_sample(sample1)),
+        sample_moments(to_sample(sample2))
+    )
+
+
 def effect_size_interpretation(d: float) -> str:
     """Interpret Cohen's d value."""
     d = abs(d)
@@ -164,16 +506,94 @@ def effect_size_interpretation(d: float) -> str:
         return "large"
 
 
+def _sample_digest(sample: Sequence[float]) -> str:
+    """Hash the float64 bytes of a sample (identical with or without NumPy)."""
+    if np is not None:
+        data = sample.tobytes()
+    else:
+        data = struct.pack(f'{len(sample)}d', *sample)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def load_cache(path: str) -> Dict[str, Dict]:
+    """Load the analysis cache, returning an empty cache if it is unreadable."""
+    try:
+        with open(path, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_cache(path: str, cache: Dict[str, Dict]) -> None:
+    """Atomically write the analysis cache, dropping entries from older code."""
+    prefix = f"{CODE_DIGEST}:"
+    cache = {key: value for key, value in cache.items() if key.startswith(prefix)}
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+def _result_to_json(result: Dict) -> Dict:
+    """Convert an analyze_metric result to JSON-serializable types."""
+    return {key: asdict(value) if isinstance(value, Statistics) else value
+            for key, value in result.items()}
+
+
+def _result_from_json(data: Dict) -> Dict:
+    """Rebuild an analyze_metric result from its cached JSON form."""
+    result = dict(data)
+    for key in ('baseline', 'esm'):
+        if key in result:
+            result[key] = Statistics(**result[key])
+    return result
+
+
 def analyze_metric(
-    baseline_values: List[float],
-    esm_values: List[float],
+    baseline_values: Sequence[float],
+    esm_values: Sequence[float],
     metric_name: str,
-    lower_is_better: bool = True
+    lower_is_better: bool = True,
+    cache: Optional[Dict[str, Dict]] = None
 ) -> Dict:
-    """Analyze a single metric comparing baseline vs ESM."""
+    """
+    Analyze a single metric comparing baseline vs ESM.
+
+    If a cache dict is given, results are looked up and stored in it keyed
+    by a hash of both samples, so unchanged data is not re-analyzed.
+    """
+
+    # Convert once and compute moments once; everything below reuses them
+    baseline_values = to_sample(baseline_values)
+    esm_values = to_sample(esm_values)
+
+    if cache is not None:
+        key = ':'.join((
+            CODE_DIGEST,
+            STATS_BACKEND,
+            _sample_digest(baseline_values),
+            _sample_digest(esm_values),
+            metric_name,
+            str(int(lower_is_better)),
+        ))
+        if key in cache:
+            return _result_from_json(cache[key])
+
+        result = analyze_metric(baseline_values, esm_values,
+                                metric_name, lower_is_better)
+        cache[key] = _result_to_json(result)
+        return result
+
+    baseline_moments = sample_moments(baseline_values)
+    esm_moments = sample_moments(esm_values)
 
-    baseline_stats = calculate_stats(baseline_values)
-    esm_stats = calculate_stats(esm_values)
+    baseline_stats = calculate_stats(baseline_values, baseline_moments)
+    esm_stats = calculate_stats(esm_values, esm_moments)
 
     if not baseline_stats or not esm_stats:
         return {'metric': metric_name, 'error': 'Insufficient data'}
@@ -187,8 +607,8 @@ def analyze_metric(
         improved = esm_stats.mean > baseline_stats.mean
 
     # Statistical tests
-    t_stat, p_value = welch_t_test(baseline_values, esm_values)
-    d = cohens_d(baseline_values, esm_values)
+    t_stat, p_value = welch_t_test_from_moments(baseline_moments, esm_moments)
+    d = cohens_d_from_moments(baseline_moments, esm_moments)
 
     return {
         'metric': metric_name,
@@ -204,96 +624,126 @@ def analyze_metric(
     }
 
 
+def _analyze_metric_worker(job: Tuple) -> Dict:
+    """Executor entry point: unpack one job tuple into analyze_metric()."""
+    return analyze_metric(*job)
+
+
+# Report templates, filled per result with str.format_map()
+_SUMMARY_HEADER = (
+    "| Metric | Baseline | ESM | Improvement | p-value | Effect Size |\n"
+    "|--------|----------|-----|-------------|---------|-------------|\n"
+)
+
+_SUMMARY_ROW = (
+    "| {metric} | "
+    "{baseline.mean:.2f} (n={baseline.n}) | "
+    "{esm.mean:.2f} (n={esm.n}) | "
+    "{improvement_pct:+.1f}% | "
+    "{p_value:.4f}{sig} | "
+    "{effect_size} (d={cohens_d:.2f}) |\n"
+)
+
+_ERROR_ROW = "| {metric} | Error: {error} | | | | |\n"
+
+_DETAIL_SECTION = (
+    "### {metric}\n\n"
+    "**Baseline (epoll)**\n"
+    "- Mean: {baseline.mean:.2f}\n"
+    "- Std Dev: {baseline.std:.2f}\n"
+    "- 95% CI: [{baseline.ci_lower:.2f}, {baseline.ci_upper:.2f}]\n"
+    "- Range: [{baseline.min_val:.2f}, {baseline.max_val:.2f}]\n"
+    "- n: {baseline.n}\n\n"
+    "**ESM**\n"
+    "- Mean: {esm.mean:.2f}\n"
+    "- Std Dev: {esm.std:.2f}\n"
+    "- 95% CI: [{esm.ci_lower:.2f}, {esm.ci_upper:.2f}]\n"
+    "- Range: [{esm.min_val:.2f}, {esm.max_val:.2f}]\n"
+    "- n: {esm.n}\n\n"
+    "**Statistical Analysis**\n"
+    "- Improvement: {improvement_pct:+.1f}%\n"
+    "- t-statistic: {t_statistic:.3f}\n"
+    "- p-value: {p_value:.4f}\n"
+    "- Cohen's d: {cohens_d:.3f} ({effect_size})\n"
+    "- Significant (p<0.05): {significant_text}\n\n"
+)
+
+
+def render_report(results: List[Dict]) -> str:
+    """Render the markdown report for analysis results."""
+
+    # Summary, details and conclusions are collected in one pass over results
+    summary = io.StringIO()
+    details = io.StringIO()
+    validated = []
+    refuted = []
+
+    for r in results:
+        if 'error' in r:
+            summary.write(_ERROR_ROW.format_map(r))
+            continue
+
+        fields = dict(r, sig="*" if r['significant'] else "",
+                      significant_text='Yes' if r['significant'] else 'No')
+        summary.write(_SUMMARY_ROW.format_map(fields))
+        details.write(_DETAIL_SECTION.format_map(fields))
+
+        if r['significant'] and r['improved']:
+            validated.append(r['metric'])
+        elif not r['improved']:
+            refuted.append(r['metric'])
+
+    buf = io.StringIO()
+    buf.write("# ESM Performance Test Results\n\n")
+    buf.write(f"Generated: {datetime.now(timezone.utc).isoformat(timespec='seconds')}\n\n")
+
+    buf.write("## Summary\n\n")
+    buf.write(_SUMMARY_HEADER)
+    buf.write(summary.getvalue())
+    buf.write("\n*p < 0.05 (statistically significant)\n\n")
+
+    # Detailed results
+    buf.write("## Detailed Results\n\n")
+    buf.write(details.getvalue())
+
+    # Conclusions
+    buf.write("## Conclusions\n\n")
+
+    if validated:
+        buf.write("**Validated claims** (statistically significant improvement):\n")
+        for m in validated:
+            buf.write(f"- {m}\n")
+        buf.write("\n")
+
+    if refuted:
+        buf.write("**Unvalidated claims** (no significant improvement or regression):\n")
+        for m in refuted:
+            buf.write(f"- {m}\n")
+        buf.write("\n")
+
+    return buf.getvalue()
+
+
 def generate_report(results: List[Dict], output_path: str) -> None:
     """Generate markdown report from analysis results."""
 
+    report = render_report(results)
     with open(output_path, 'w') as f:
-        f.write("# ESM Performance Test Results\n\n")
-        f.write(f"Generated: {os.popen('date').read().strip()}\n\n")
+        f.write(report)
 
-        f.write("## Summary\n\n")
-        f.write("| Metric | Baseline | ESM | Improvement | p-value | Effect Size |\n")
-        f.write("|--------|----------|-----|-------------|---------|-------------|\n")
-
-        for r in results:
-            if 'error' in r:
-                f.write(f"| {r['metric']} | Error: {r['error']} | | | | |\n")
-                continue
-
-            baseline = r['baseline']
-            esm = r['esm']
-            sig = "*" if r['significant'] else ""
-
-            f.write(f"| {r['metric']} | "
-                   f"{baseline.mean:.2f} (n={baseline.n}) | "
-                   f"{esm.mean:.2f} (n={esm.n}) | "
-                   f"{r['improvement_pct']:+.1f}% | "
-                   f"{r['p_value']:.4f}{sig} | "
-                   f"{r['effect_size']} (d={r['cohens_d']:.2f}) |\n")
-
-        f.write("\n*p < 0.05 (statistically significant)\n\n")
-
-        # Detailed results
-        f.write("## Detailed Results\n\n")
-
-        for r in results:
-            if 'error' in r:
-                continue
-
-            f.write(f"### {r['metric']}\n\n")
-
-            baseline = r['baseline']
-            esm = r['esm']
-
-            f.write("**Baseline (epoll)**\n")
-            f.write(f"- Mean: {baseline.mean:.2f}\n")
-            f.write(f"- Std Dev: {baseline.std:.2f}\n")
-            f.write(f"- 95% CI: [{baseline.ci_lower:.2f}, {baseline.ci_upper:.2f}]\n")
-            f.write(f"- Range: [{baseline.min_val:.2f}, {baseline.max_val:.2f}]\n")
-            f.write(f"- n: {baseline.n}\n\n")
-
-            f.write("**ESM**\n")
-            f.write(f"- Mean: {esm.mean:.2f}\n")
-            f.write(f"- Std Dev: {esm.std:.2f}\n")
-            f.write(f"- 95% CI: [{esm.ci_lower:.2f}, {esm.ci_upper:.2f}]\n")
-            f.write(f"- Range: [{esm.min_val:.2f}, {esm.max_val:.2f}]\n")
-            f.write(f"- n: {esm.n}\n\n")
-
-            f.write("**Statistical Analysis**\n")
-            f.write(f"- Improvement: {r['improvement_pct']:+.1f}%\n")
-            f.write(f"- t-statistic: {r['t_statistic']:.3f}\n")
-            f.write(f"- p-value: {r['p_value']:.4f}\n")
-            f.write(f"- Cohen's d: {r['cohens_d']:.3f} ({r['effect_size']})\n")
-            f.write(f"- Significant (p<0.05): {'Yes' if r['significant'] else 'No'}\n\n")
-
-        # Conclusions
-        f.write("## Conclusions\n\n")
-
-        validated = []
-        refuted = []
-
-        for r in results:
-            if 'error' in r:
-                continue
-
-            if r['significant'] and r['improved']:
-                validated.append(r['metric'])
-            elif not r['improved']:
-                refuted.append(r['metric'])
-
-        if validated:
-            f.write("**Validated claims** (statistically significant improvement):\n")
-            for m in validated:
-                f.write(f"- {m}\n")
-            f.write("\n")
+    print(f"Report generated: {output_path}")
 
-        if refuted:
-            f.write("**Unvalidated claims** (no significant improvement or regression):\n")
-            for m in refuted:
-                f.write(f"- {m}\n")
-            f.write("\n")
 
-    print(f"Report generated: {output_path}")
+# Each script runs standalone, so small CLI helpers are kept per script
+def _positive_int(value: str) -> int:
+    """argparse type for options that must be a positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value!r}")
+    return number
 
 
 def main():
@@ -306,6 +756,12 @@ def main():
                        help='Directory containing ESM results')
     parser.add_argument('--output', '-o', default='../report.md',
                        help='Output report path')
+    parser.add_argument('--jobs', '-j', type=_positive_int, default=1,
+                       help='Worker threads for analyzing metrics (default: 1)')
+    parser.add_argument('--cache-file', default=DEFAULT_CACHE_PATH,
+                       help='Cache of per-metric results keyed by input data')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Recompute every metric and leave the cache untouched')
 
     args = parser.parse_args()
 
@@ -314,146 +770,40 @@ def main():
     baseline_dir = os.path.join(script_dir, args.baseline_dir)
     esm_dir = os.path.join(script_dir, args.esm_dir)
     output_path = os.path.join(script_dir, args.output)
+    cache_path = os.path.join(script_dir, args.cache_file)
+
+    print("Loading baseline results...")
+    baseline_samples = load_samples(baseline_dir, METRICS)
+    print("Loading ESM results...")
+    esm_samples = load_samples(esm_dir, METRICS)
+
+    cache = None if args.no_cache else load_cache(cache_path)
+    cache_size = len(cache) if cache is not None else 0
+
+    print("Analyzing results...")
+    jobs = []
+    for m in METRICS:
+        key = (m.filename, m.column, m.scenario)
+        baseline_vals = baseline_samples[key]
+        esm_vals = esm_samples[key]
+
+        if len(baseline_vals) and len(esm_vals):
+            jobs.append((baseline_vals, esm_vals, m.name, m.lower_is_better, cache))
+
+    # Metrics are independent, but with typical sample sizes each takes a
+    # fraction of a millisecond and holds the GIL throughout, so a thread
+    # pool only pays off for large samples and is opt-in via --jobs
+    if args.jobs > 1 and len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            results = list(executor.map(_analyze_metric_worker, jobs))
+    else:
+        results = [_analyze_metric_worker(job) for job in jobs]
 
-    results = []
-
-    # Analyze latency
-    print("Analyzing latency results...")
-    baseline_latency = load_csv(os.path.join(baseline_dir, 'latency.csv'))
-    esm_latency = load_csv(os.path.join(esm_dir, 'latency.csv'))
-
-    for scenario in ['single_tap', 'scroll', 'fast_swipe']:
-        baseline_vals = [float(r['latency_ms']) for r in baseline_latency
-                        if r.get('scenario') == scenario and r.get('latency_ms')]
-        esm_vals = [float(r['latency_ms']) for r in esm_latency
-                   if r.get('scenario') == scenario and r.get('latency_ms')]
-
-        if baseline_vals and esm_vals:
-            results.append(analyze_metric(
-                baseline_vals, esm_vals,
-                f"Latency - {scenario.replace('_', ' ').title()} (ms)",
-                lower_is_better=True
-            ))
-
-    # Analyze CPU
-    print("Analyzing CPU results...")
-    baseline_cpu = load_csv(os.path.join(baseline_dir, 'cpu.csv'))
-    esm_cpu = load_csv(os.path.join(esm_dir, 'cpu.csv'))
-
-    baseline_ss = [float(r['system_server_cpu']) for r in baseline_cpu
-                   if r.get('system_server_cpu')]
-    esm_ss = [float(r['system_server_cpu']) for r in esm_cpu
-              if r.get('system_server_cpu')]
-
-    if baseline_ss and esm_ss:
-        results.append(analyze_metric(
-            baseline_ss, esm_ss,
-            "CPU - system_server (%)",
-            lower_is_better=True
-        ))
-
-    baseline_total = [float(r['total_cpu']) for r in baseline_cpu
-                      if r.get('total_cpu')]
-    esm_total = [float(r['total_cpu']) for r in esm_cpu
-                 if r.get('total_cpu')]
-
-    if baseline_total and esm_total:
-        results.append(analyze_metric(
-            baseline_total, esm_total,
-            "CPU - Total (%)",
-            lower_is_better=True
-        ))
-
-    # Analyze syscalls
-    print("Analyzing syscall results...")
-    baseline_syscalls = load_csv(os.path.join(baseline_dir, 'syscalls.csv'))
-    esm_syscalls = load_csv(os.path.join(esm_dir, 'syscalls.csv'))
-
-    baseline_total_sc = [float(r['total']) for r in baseline_syscalls
-                         if r.get('total')]
-    esm_total_sc = [float(r['total']) for r in esm_syscalls
-                    if r.get('total')]
-
-    if baseline_total_sc and esm_total_sc:
-        results.append(analyze_metric(
-            baseline_total_sc, esm_total_sc,
-            "Syscalls (per 100 events)",
-            lower_is_better=True
-        ))
-
-    # Analyze wakeups
-    print("Analyzing wakeup results...")
-    baseline_wakeups = load_csv(os.path.join(baseline_dir, 'wakeups.csv'))
-    esm_wakeups = load_csv(os.path.join(esm_dir, 'wakeups.csv'))
-
-    baseline_wps = [float(r['wakeups_per_sec']) for r in baseline_wakeups
-                    if r.get('wakeups_per_sec')]
-    esm_wps = [float(r['wakeups_per_sec']) for r in esm_wakeups
-               if r.get('wakeups_per_sec')]
-
-    if baseline_wps and esm_wps:
-        results.append(analyze_metric(
-            baseline_wps, esm_wps,
-            "Wakeups per second",
-            lower_is_better=True
-        ))
-
-    # Analyze power (idle and active scenarios)
-    print("Analyzing power results...")
-    baseline_power = load_csv(os.path.join(baseline_dir, 'power.csv'))
-    esm_power = load_csv(os.path.join(esm_dir, 'power.csv'))
-
-    # Idle power - battery drain
-    baseline_idle_drain = [float(r['battery_drain_pct']) for r in baseline_power
-                           if r.get('scenario') == 'idle' and r.get('battery_drain_pct')]
-    esm_idle_drain = [float(r['battery_drain_pct']) for r in esm_power
-                      if r.get('scenario') == 'idle' and r.get('battery_drain_pct')]
-
-    if baseline_idle_drain and esm_idle_drain:
-        results.append(analyze_metric(
-            baseline_idle_drain, esm_idle_drain,
-            "Power - Idle Battery Drain (%)",
-            lower_is_better=True
-        ))
-
-    # Idle power - wakeups
-    baseline_idle_wakeups = [float(r['wakeups_per_sec']) for r in baseline_power
-                              if r.get('scenario') == 'idle' and r.get('wakeups_per_sec')]
-    esm_idle_wakeups = [float(r['wakeups_per_sec']) for r in esm_power
-                         if r.get('scenario') == 'idle' and r.get('wakeups_per_sec')]
-
-    if baseline_idle_wakeups and esm_idle_wakeups:
-        results.append(analyze_metric(
-            baseline_idle_wakeups, esm_idle_wakeups,
-            "Power - Idle Wakeups/sec",
-            lower_is_better=True
-        ))
-
-    # Active power - battery drain
-    baseline_active_drain = [float(r['battery_drain_pct']) for r in baseline_power
-                              if r.get('scenario') == 'active' and r.get('battery_drain_pct')]
-    esm_active_drain = [float(r['battery_drain_pct']) for r in esm_power
-                         if r.get('scenario') == 'active' and r.get('battery_drain_pct')]
-
-    if baseline_active_drain and esm_active_drain:
-        results.append(analyze_metric(
-            baseline_active_drain, esm_active_drain,
-            "Power - Active Battery Drain (%)",
-            lower_is_better=True
-        ))
-
-    # Active power - wakeups
-    baseline_active_wakeups = [float(r['wakeups_per_sec']) for r in baseline_power
-                                if r.get('scenario') == 'active' and r.get('wakeups_per_sec')]
-    esm_active_wakeups = [float(r['wakeups_per_sec']) for r in esm_power
-                           if r.get('scenario') == 'active' and r.get('wakeups_per_sec')]
-
-    if baseline_active_wakeups and esm_active_wakeups:
-        results.append(analyze_metric(
-            baseline_active_wakeups, esm_active_wakeups,
-            "Power - Active Wakeups/sec",
-            lower_is_better=True
-        ))
+    if cache is not None and len(cache) != cache_size:
+        try:
+            save_cache(cache_path, cache)
+        except OSError as e:
+            print(f"Warning: could not write cache {cache_path}: {e}", file=sys.stderr)
 
     # Generate report
     if results:
@@ -13,14 +13,44 @@ Usage:
 
 import sys
 import re
+import math
 import argparse
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# NumPy is optional; without it timestamps are processed as Python lists.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional compiled parser (_parse_core.pyx), built by pyximport on first
+# import when Cython and a C compiler are available
+try:
+    import pyximport
+    _importers = pyximport.install(language_level=3)
+    try:
+        from _parse_core import split_ftrace_line as _split_ftrace_fields
+    finally:
+        pyximport.uninstall(*_importers)
+except ImportError:
+    _split_ftrace_fields = None
+
+# ftrace format: task-pid [cpu] flags timestamp: event: details
+_FTRACE_RE = re.compile(r'^\s*(.+?)-(\d+)\s+\[(\d+)\]\s+[\w.]+\s+([\d.]+):\s+(\w+):\s*(.*)$')
+
+# Common touchscreen controller names, searched for in lowercased details.
+# Lowering the short details string first is cheaper than re.IGNORECASE,
+# which keeps SRE from using its fast literal scan.
+_TOUCH_RE = re.compile(r'fts|touch|sec_ts|synaptics|goodix|atmel|nt36')
+
 
+class TraceEvent(NamedTuple):
+    """
+    Represents a single ftrace event.
 
-@dataclass
-class TraceEvent:
-    """Represents a single ftrace event."""
+    A NamedTuple rather than a dataclass: one is built per trace line, and
+    a tuple has no per-instance __dict__ and is constructed in C.
+    """
     timestamp: float      # Timestamp in seconds
     cpu: int             # CPU number
     task: str            # Task name
@@ -38,37 +68,35 @@ def parse_ftrace_line(line: str) -> Optional[TraceEvent]:
     InputReader-1234 [002] ....  1234.567890: input_event: type=3 code=53 value=500
 
     """
-    # Skip comment lines and empty lines
-    if line.startswith('#') or not line.strip():
+    # Skip comment lines, empty lines, and anything without the
+    # "[cpu]" and "timestamp:" fields (cheaper than a failed regex match)
+    if line.startswith('#') or '[' not in line or ':' not in line:
         return None
 
-    # ftrace format: task-pid [cpu] flags timestamp: event: details
-    pattern = r'^\s*(.+?)-(\d+)\s+\[(\d+)\]\s+[\w.]+\s+([\d.]+):\s+(\w+):\s*(.*)$'
-    match = re.match(pattern, line)
+    if _split_ftrace_fields is not None:
+        fields = _split_ftrace_fields(line)
+        if fields is not None:
+            return TraceEvent(*fields)
+
+    match = _FTRACE_RE.match(line)
 
     if not match:
         return None
 
     return TraceEvent(
-        task=match.group(1).strip(),
-        pid=int(match.group(2)),
-        cpu=int(match.group(3)),
-        timestamp=float(match.group(4)),
-        event_type=match.group(5),
-        details=match.group(6)
+        float(match.group(4)),
+        int(match.group(3)),
+        match.group(1).strip(),
+        int(match.group(2)),
+        match.group(5),
+        match.group(6),
     )
 
 
 def is_touch_irq(event: TraceEvent) -> bool:
     """Check if this is a touchscreen IRQ event."""
-    if event.event_type != 'irq_handler_entry':
-        return False
-
-    # Common touchscreen controller names
-    touch_names = ['fts', 'touch', 'sec_ts', 'synaptics', 'goodix', 'atmel', 'nt36']
-
-    details_lower = event.details.lower()
-    return any(name in details_lower for name in touch_names)
+    return (event.event_type == 'irq_handler_entry'
+            and _TOUCH_RE.search(event.details.lower()) is not None)
 
 
 def is_input_event(event: TraceEvent) -> bool:
@@ -81,30 +109,91 @@ def is_esm_event(event: TraceEvent) -> bool:
     return 'esm' in event.event_type.lower()
 
 
-def calculate_single_latency(events: List[TraceEvent]) -> Optional[float]:
+def _span_latency(first_irq_ts: float, last_input_ts: float,
+                  max_ms: float) -> Optional[float]:
+    """Latency in ms from first IRQ to last input_event, or None if implausible."""
+    latency_ms = (last_input_ts - first_irq_ts) * 1000
+
+    # Sanity check - latency should be positive and reasonable
+    if latency_ms < 0 or latency_ms > max_ms:
+        return None
+
+    return latency_ms
+
+
+def classify_events(events: Iterable[TraceEvent]) -> Tuple[List[float], List[float], int, int]:
     """
-    Calculate latency for a single touch event.
+    Classify events in one pass, dispatching once on the event type.
 
-    Returns latency in milliseconds from first IRQ to last input_event.
+    Returns (touch IRQ timestamps, input_event timestamps, total event
+    count, ESM event count). events may be a list or a stream.
     """
-    irq_events = [e for e in events if is_touch_irq(e)]
-    input_events = [e for e in events if is_input_event(e)]
+    irq_ts = []
+    input_ts = []
+    total_events = 0
+    esm_events = 0
+
+    for event in events:
+        total_events += 1
+        event_type = event.event_type
+        if event_type == 'input_event':
+            input_ts.append(event.timestamp)
+        elif event_type == 'irq_handler_entry':
+            if is_touch_irq(event):
+                irq_ts.append(event.timestamp)
+        elif is_esm_event(event):
+            # The IRQ and input_event types cannot also be ESM events
+            esm_events += 1
+
+    return irq_ts, input_ts, total_events, esm_events
+
+
+def irq_input_span(events: Iterable[TraceEvent]) -> Optional[Tuple[float, float]]:
+    """
+    Return (first touch IRQ, last input_event) timestamps, or None if either
+    is missing, tracking both in one pass without building timestamp lists.
+    """
+    first_irq_ts = math.inf
+    last_input_ts = -math.inf
+
+    for event in events:
+        event_type = event.event_type
+        if event_type == 'input_event':
+            if event.timestamp > last_input_ts:
+                last_input_ts = event.timestamp
+        elif event_type == 'irq_handler_entry' and is_touch_irq(event):
+            if event.timestamp < first_irq_ts:
+                first_irq_ts = event.timestamp
+
+    if first_irq_ts == math.inf or last_input_ts == -math.inf:
+        return None
+    return first_irq_ts, last_input_ts
+
 
-    if not irq_events or not input_events:
+def single_latency(span: Optional[Tuple[float, float]]) -> Optional[float]:
+    """Latency in ms over the (first IRQ, last input_event) span of a single touch."""
+    if span is None:
         return None
 
-    # Get first IRQ and last input event
-    first_irq = min(irq_events, key=lambda e: e.timestamp)
-    last_input = max(input_events, key=lambda e: e.timestamp)
+    return _span_latency(*span, 1000)
 
-    # Calculate latency in milliseconds
-    latency_ms = (last_input.timestamp - first_irq.timestamp) * 1000
 
-    # Sanity check - latency should be positive and reasonable
-    if latency_ms < 0 or latency_ms > 1000:
+def aggregate_latency(span: Optional[Tuple[float, float]]) -> Optional[float]:
+    """Latency in ms over the (first IRQ, last input_event) span of a whole gesture."""
+    if span is None:
         return None
 
-    return latency_ms
+    # Allow up to 10s for gestures
+    return _span_latency(*span, 10000)
+
+
+def calculate_single_latency(events: List[TraceEvent]) -> Optional[float]:
+    """
+    Calculate latency for a single touch event.
+
+    Returns latency in milliseconds from first IRQ to last input_event.
+    """
+    return single_latency(irq_input_span(events))
 
 
 def calculate_aggregate_latency(events: List[TraceEvent]) -> Optional[float]:
@@ -113,44 +202,55 @@ def calculate_aggregate_latency(events: List[TraceEvent]) -> Optional[float]:
 
     Returns the total time from first IRQ to last input_event.
     """
-    irq_events = [e for e in events if is_touch_irq(e)]
-    input_events = [e for e in events if is_input_event(e)]
-
-    if not irq_events or not input_events:
-        return None
-
-    first_irq = min(irq_events, key=lambda e: e.timestamp)
-    last_input = max(input_events, key=lambda e: e.timestamp)
+    return aggregate_latency(irq_input_span(events))
 
-    latency_ms = (last_input.timestamp - first_irq.timestamp) * 1000
 
-    if latency_ms < 0 or latency_ms > 10000:  # Allow up to 10s for gestures
-        return None
+def sorted_timestamps(timestamps: Sequence[float]) -> Sequence[float]:
+    """
+    Return timestamps sorted, as a float64 array when NumPy is available.
 
-    return latency_ms
+    ftrace merges the per-CPU buffers in time order, so timestamps collected
+    in file order are normally sorted already. That is checked in one
+    vectorized comparison and the sort only runs for out-of-order input
+    (e.g. concatenated dumps). sorted() needs no check: Timsort handles an
+    ordered list in a single linear pass.
+    """
+    if np is not None:
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if (timestamps[1:] < timestamps[:-1]).any():
+            timestamps = np.sort(timestamps)
+        return timestamps
+    return sorted(timestamps)
 
 
-def calculate_per_event_latencies(events: List[TraceEvent]) -> List[float]:
+def match_event_latencies(irq_ts: Sequence[float], input_ts: Sequence[float]) -> List[float]:
     """
-    Calculate individual latencies for each IRQ->input_event pair.
+    Match each IRQ timestamp to the first later input_event timestamp.
 
-    Useful for detailed analysis of multi-event traces.
+    The timestamps may be in any order. Returns latencies in milliseconds.
     """
-    irq_events = sorted([e for e in events if is_touch_irq(e)],
-                       key=lambda e: e.timestamp)
-    input_events = sorted([e for e in events if is_input_event(e)],
-                         key=lambda e: e.timestamp)
+    irq_ts = sorted_timestamps(irq_ts)
+    input_ts = sorted_timestamps(input_ts)
+
+    if np is not None:
+
+        # Index of the first input event after each IRQ, all at once
+        idx = np.searchsorted(input_ts, irq_ts, side='right')
+        found = idx < len(input_ts)
+        latency = (input_ts[idx[found]] - irq_ts[found]) * 1000
+
+        # Reasonable single-event latency
+        return latency[(latency > 0) & (latency < 100)].tolist()
 
     latencies = []
 
-    # Match IRQ events to subsequent input events
     input_idx = 0
-    for irq in irq_events:
+    for t_irq in irq_ts:
         # Find first input event after this IRQ
-        while input_idx < len(input_events):
-            inp = input_events[input_idx]
-            if inp.timestamp > irq.timestamp:
-                latency = (inp.timestamp - irq.timestamp) * 1000
+        while input_idx < len(input_ts):
+            t_input = input_ts[input_idx]
+            if t_input > t_irq:
+                latency = (t_input - t_irq) * 1000
                 if 0 < latency < 100:  # Reasonable single-event latency
                     latencies.append(latency)
                 break
@@ -159,23 +259,39 @@ def calculate_per_event_latencies(events: List[TraceEvent]) -> List[float]:
     return latencies
 
 
-def parse_trace_file(filepath: str) -> List[TraceEvent]:
-    """Parse entire trace file."""
-    events = []
+def calculate_per_event_latencies(events: List[TraceEvent]) -> List[float]:
+    """
+    Calculate individual latencies for each IRQ->input_event pair.
+
+    Useful for detailed analysis of multi-event traces.
+    """
+    irq_ts, input_ts, _, _ = classify_events(events)
+    return match_event_latencies(irq_ts, input_ts)
 
+
+def iter_trace_events(filepath: str) -> Iterator[TraceEvent]:
+    """Yield the events of a trace file as it is read."""
+    # Text-mode line iteration is already a buffered C loop; reading binary
+    # chunks and splitting them in Python measured slower.
     with open(filepath, 'r') as f:
         for line in f:
             event = parse_ftrace_line(line)
             if event:
-                events.append(event)
+                yield event
 
-    return events
+
+def parse_trace_file(filepath: str) -> List[TraceEvent]:
+    """Parse entire trace file."""
+    return list(iter_trace_events(filepath))
 
 
 def analyze_trace(filepath: str, aggregate: bool = False) -> dict:
     """
     Analyze a trace file and return statistics.
 
+    The file is streamed in a single pass: events are counted and only the
+    IRQ and input_event timestamps are kept, not the events themselves.
+
     Args:
         filepath: Path to ftrace output file
         aggregate: If True, calculate aggregate latency for entire trace
@@ -184,20 +300,21 @@ def analyze_trace(filepath: str, aggregate: bool = False) -> dict:
     Returns:
         Dictionary with analysis results
     """
-    events = parse_trace_file(filepath)
+    irq_ts, input_ts, total_events, esm_events = classify_events(iter_trace_events(filepath))
 
     results = {
-        'total_events': len(events),
-        'irq_events': len([e for e in events if is_touch_irq(e)]),
-        'input_events': len([e for e in events if is_input_event(e)]),
-        'esm_events': len([e for e in events if is_esm_event(e)]),
+        'total_events': total_events,
+        'irq_events': len(irq_ts),
+        'input_events': len(input_ts),
+        'esm_events': esm_events,
     }
 
     if aggregate:
-        latency = calculate_aggregate_latency(events)
-        results['aggregate_latency_ms'] = latency
+        # The timestamp lists already exist here for the event counts
+        span = (min(irq_ts), max(input_ts)) if irq_ts and input_ts else None
+        results['aggregate_latency_ms'] = aggregate_latency(span)
     else:
-        latencies = calculate_per_event_latencies(events)
+        latencies = match_event_latencies(irq_ts, input_ts)
         if latencies:
             results['latencies_ms'] = latencies
             results['mean_latency_ms'] = sum(latencies) / len(latencies)
@@ -11,64 +11,113 @@ This measures the epoll/ESM critical path.
 """
 
 import argparse
+import bisect
+import contextlib
 import csv
+import mmap
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
+
+# NumPy is optional; without it gestures are matched one at a time.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Regex patterns for ftrace lines (bytes, matched against the mapped file)
+# Format: <task>-<pid> [<cpu>] <flags> <timestamp>: <event>: <data>
+_INPUT_EVENT_RE = re.compile(
+    rb'\s*\S+-\d+\s+\[\d+\]\s+\S+\s+(\d+\.\d+):\s+input_event:\s+dev=(\S+)\s+type=(\d+)\s+code=(\d+)\s+value=(\d+)'
+)
+
+_SCHED_WAKEUP_RE = re.compile(
+    rb'\s*\S+-\d+\s+\[\d+\]\s+\S+\s+(\d+\.\d+):\s+sched_wakeup:\s+comm=(\S+)\s+pid=(\d+)'
+)
+
+
+def _lines_containing(data, needle: bytes) -> Iterator[bytes]:
+    """Yield each line of data (bytes or mmap) that contains needle, in order."""
+    find = data.find
+    pos = find(needle)
+    while pos >= 0:
+        start = data.rfind(b'\n', 0, pos) + 1
+        end = find(b'\n', pos)
+        if end < 0:
+            end = len(data)
+        yield data[start:end]
+        pos = find(needle, end)
 
 
 def parse_ftrace_file(trace_path: str) -> List[Dict]:
     """Parse a single ftrace text file and extract latency measurements."""
+    results, warning = _parse_ftrace_file(trace_path)
+    if warning:
+        print(warning, file=sys.stderr)
+    return results
 
-    results = []
 
-    # Regex patterns for ftrace lines
-    # Format: <task>-<pid> [<cpu>] <flags> <timestamp>: <event>: <data>
-    input_event_pattern = re.compile(
-        r'\s*\S+-\d+\s+\[\d+\]\s+\S+\s+(\d+\.\d+):\s+input_event:\s+dev=(\S+)\s+type=(\d+)\s+code=(\d+)\s+value=(\d+)'
-    )
+def _parse_ftrace_file(trace_path: str) -> Tuple[List[Dict], Optional[str]]:
+    """
+    parse_ftrace_file() without the printing: returns (results, warning).
 
-    sched_wakeup_pattern = re.compile(
-        r'\s*\S+-\d+\s+\[\d+\]\s+\S+\s+(\d+\.\d+):\s+sched_wakeup:\s+comm=(\S+)\s+pid=(\d+)'
-    )
+    Worker processes return the warning instead of printing it, so main()
+    can report it next to that file's "Analyzing" line.
+    """
+    results = []
 
     input_events = []  # (timestamp, type, code, value)
     wakeup_events = []  # (timestamp, comm)
 
     try:
-        with open(trace_path, 'r') as f:
-            for line in f:
-                # Parse input_event
-                match = input_event_pattern.search(line)
+        # The trace is mapped and only the lines naming an event of
+        # interest are sliced out; every other line (the vast majority in
+        # a full-system trace) is skipped by find() without ever being
+        # copied, decoded or visited from Python.
+        with open(trace_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                data = b''  # an empty file cannot be mapped
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            # Parse input_event
+            for line in _lines_containing(data, b'input_event:'):
+                match = _INPUT_EVENT_RE.search(line)
                 if match:
                     ts = float(match.group(1))
                     ev_type = int(match.group(3))
                     code = int(match.group(4))
                     value = int(match.group(5))
                     input_events.append((ts, ev_type, code, value))
-                    continue
 
-                # Parse sched_wakeup for InputDispatcher
-                match = sched_wakeup_pattern.search(line)
+            # Parse sched_wakeup for InputDispatcher
+            for line in _lines_containing(data, b'sched_wakeup:'):
+                if b'InputDispatcher' not in line and b'InputReader' not in line:
+                    continue
+                if b'input_event:' in line and _INPUT_EVENT_RE.search(line):
+                    continue  # already taken as an input_event
+                match = _SCHED_WAKEUP_RE.search(line)
                 if match:
                     ts = float(match.group(1))
-                    comm = match.group(2)
+                    comm = match.group(2).decode('utf-8', 'replace')
                     if 'InputDispatcher' in comm or 'InputReader' in comm:
                         wakeup_events.append((ts, comm))
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
 
     except Exception as e:
-        print(f"Error parsing {trace_path}: {e}", file=sys.stderr)
-        return results
+        return results, f"Error parsing {trace_path}: {e}"
 
     if not input_events:
-        print(f"No input_event found in {trace_path}", file=sys.stderr)
-        return results
+        return results, f"No input_event found in {trace_path}"
 
     if not wakeup_events:
-        print(f"No InputDispatcher wakeups found in {trace_path}", file=sys.stderr)
-        return results
+        return results, f"No InputDispatcher wakeups found in {trace_path}"
 
     # Group input events into gestures
     # A gesture starts with BTN_TOUCH press (type=1, code=330, value=1)
@@ -79,21 +128,58 @@ def parse_ftrace_file(trace_path: str) -> List[Dict]:
         if ev_type == 1 and code == 330 and value == 1:
             gesture_starts.append(ts)
 
-    # For each gesture start, find the next InputDispatcher wakeup
+    # For each gesture start, find the next InputDispatcher wakeup by
+    # binary search over the wakeup timestamps. ftrace output is normally
+    # time-ordered already; out-of-order input (e.g. concatenated dumps)
+    # is stable-sorted first, keeping each comm with its timestamp and
+    # ties in file order, as parse_ftrace.sorted_timestamps() does.
+    if np is not None:
+        wakeup_ts = np.fromiter((t for t, _ in wakeup_events),
+                                dtype=np.float64, count=len(wakeup_events))
+        if (wakeup_ts[1:] < wakeup_ts[:-1]).any():
+            order = np.argsort(wakeup_ts, kind='stable')
+            wakeup_ts = wakeup_ts[order]
+            wakeup_events = [wakeup_events[i] for i in order.tolist()]
+        starts = np.asarray(gesture_starts, dtype=np.float64)
+
+        # All gestures are searched in one vectorized call
+        idx = np.searchsorted(wakeup_ts, starts, side='right')
+        found = idx < len(wakeup_ts)
+        starts, idx = starts[found], idx[found]
+        latency = (wakeup_ts[idx] - starts) * 1000  # Convert to ms
+        keep = (latency > 0) & (latency < 50)  # Reasonable range
+
+        for t1, i, latency_ms in zip(starts[keep].tolist(), idx[keep].tolist(),
+                                     latency[keep].tolist()):
+            t2, comm = wakeup_events[i]
+            results.append({
+                'kernel_ts': t1,
+                'wakeup_ts': t2,
+                'latency_ms': latency_ms,
+                'wakeup_thread': comm
+            })
+        return results, None
+
+    # list.sort is stable and linear on already-ordered input
+    wakeup_events.sort(key=lambda event: event[0])
+    wakeup_ts = [t for t, _ in wakeup_events]
+
     for t1 in gesture_starts:
-        for t2, comm in wakeup_events:
-            if t2 > t1:
-                latency_ms = (t2 - t1) * 1000  # Convert to ms
-                if 0 < latency_ms < 50:  # Reasonable range
-                    results.append({
-                        'kernel_ts': t1,
-                        'wakeup_ts': t2,
-                        'latency_ms': latency_ms,
-                        'wakeup_thread': comm
-                    })
-                break
+        idx = bisect.bisect_right(wakeup_ts, t1)
+        if idx == len(wakeup_events):
+            continue
+
+        t2, comm = wakeup_events[idx]
+        latency_ms = (t2 - t1) * 1000  # Convert to ms
+        if 0 < latency_ms < 50:  # Reasonable range
+            results.append({
+                'kernel_ts': t1,
+                'wakeup_ts': t2,
+                'latency_ms': latency_ms,
+                'wakeup_thread': comm
+            })
 
-    return results
+    return results, None
 
 
 def get_scenario_from_filename(filename: str) -> str:
@@ -108,12 +194,26 @@ def get_scenario_from_filename(filename: str) -> str:
     return 'unknown'
 
 
+# Each script runs standalone, so small CLI helpers are kept per script
+def _positive_int(value: str) -> int:
+    """argparse type for options that must be a positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value!r}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Parse ftrace text files for input latency analysis'
     )
     parser.add_argument('traces_dir', help='Directory containing ftrace .txt files')
     parser.add_argument('output_csv', help='Output CSV file path')
+    parser.add_argument('--jobs', '-j', type=_positive_int, default=None,
+                        help='Trace files to parse in parallel (default: CPU count)')
 
     args = parser.parse_args()
 
@@ -136,39 +236,47 @@ def main():
 
     all_results = []
 
-    for trace_file in trace_files:
-        scenario = get_scenario_from_filename(trace_file.name)
-        print(f"Analyzing: {trace_file.name} ({scenario})")
-
-        results = parse_ftrace_file(str(trace_file))
-        print(f"  Found {len(results)} latency measurements")
-
-        for i, result in enumerate(results, 1):
-            all_results.append({
-                'scenario': scenario,
-                'sample': i,
-                'latency_ms': result['latency_ms']
-            })
-
-    # Write CSV output
+    # Files are independent and parsing is CPU-bound, so they are spread
+    # over worker processes; map() still yields results in file order.
+    # A single file or job is parsed in-process to skip the pool startup.
+    paths = [str(trace_file) for trace_file in trace_files]
+    if len(paths) > 1 and args.jobs != 1:
+        executor = ProcessPoolExecutor(max_workers=args.jobs)
+        map_files = executor.map
+    else:
+        executor = contextlib.nullcontext()
+        map_files = map
+
+    with executor:
+        file_results = map_files(_parse_ftrace_file, paths)
+        for trace_file, (results, warning) in zip(trace_files, file_results):
+            scenario = get_scenario_from_filename(trace_file.name)
+            print(f"Analyzing: {trace_file.name} ({scenario})")
+            if warning:
+                print(warning, file=sys.stderr)
+            print(f"  Found {len(results)} latency measurements")
+
+            for i, result in enumerate(results, 1):
+                all_results.append((scenario, i, result['latency_ms']))
+
+    # Write CSV output. The fields never need quoting (fixed scenario
+    # names and numbers), so rows are formatted directly and written in
+    # one call instead of one csv.writer call per row; the '\r\n' line
+    # ending matches csv.writer's default.
     with open(args.output_csv, 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerow(['scenario', 'sample', 'latency_ms'])
 
-        for result in all_results:
-            writer.writerow([
-                result['scenario'],
-                result['sample'],
-                f"{result['latency_ms']:.3f}"
-            ])
+        f.write(''.join(f"{scenario},{sample},{latency_ms:.3f}\r\n"
+                        for scenario, sample, latency_ms in all_results))
 
     print(f"\nResults written to: {args.output_csv}")
 
     # Print summary
     from collections import defaultdict
     by_scenario = defaultdict(list)
-    for r in all_results:
-        by_scenario[r['scenario']].append(r['latency_ms'])
+    for scenario, _, latency_ms in all_results:
+        by_scenario[scenario].append(latency_ms)
 
     print("\nSummary:")
     for scenario, latencies in sorted(by_scenario.items()):